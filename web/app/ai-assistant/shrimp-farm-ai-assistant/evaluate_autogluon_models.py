@@ -18,6 +18,7 @@ optimistic and may not reflect real-world performance on real farm data.
 from __future__ import annotations
 
 import argparse
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Tuple
 
@@ -54,7 +55,7 @@ def _mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
 
 def generate_synthetic_dataset(samples: int, seed: int) -> pd.DataFrame:
     rng = np.random.default_rng(seed)
-    generator = TrainingDataGenerator()
+    generator = TrainingDataGenerator(seed=seed)
     agent = AutoGluonDecisionAgent()
 
     scenarios = ["normal", "good", "poor", "critical"]
@@ -65,17 +66,13 @@ def generate_synthetic_dataset(samples: int, seed: int) -> pd.DataFrame:
     all_labor = []
     labels: Dict[str, list] = {"action_type": [], "urgency": [], "priority": [], "feed_amount": []}
 
-    # Ensure reproducible randomness for both numpy and Python's random (used in generator)
-    # The generator uses the stdlib `random`, so we seed it too.
-    import random  # local import to avoid unused import warnings
-
-    random.seed(seed)
+    now = datetime.now()
 
     for i in range(samples):
         # Evenly distribute scenarios, but add a tiny shuffle via RNG for variety
         scenario = scenarios[int(rng.integers(0, len(scenarios)))] if i % 4 == 0 else scenarios[i % 4]
 
-        wq = generator.generate_water_quality_data(pond_id=1, scenario=scenario)
+        wq = generator.generate_water_quality_data(pond_id=1, scenario=scenario, timestamp=now)
         feed = generator.generate_feed_data(pond_id=1, water_quality=wq)
         energy = generator.generate_energy_data(pond_id=1, water_quality=wq)
         labor = generator.generate_labor_data(pond_id=1, water_quality=wq, energy=energy)
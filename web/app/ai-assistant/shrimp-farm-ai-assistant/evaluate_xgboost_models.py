@@ -80,10 +80,7 @@ def _mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
 
 def generate_synthetic_dataset(samples: int, seed: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Generate synthetic dataset with features and labels using the same method as training"""
-    import random
-    random.seed(seed)
-    
-    generator = TrainingDataGenerator()
+    generator = TrainingDataGenerator(seed=seed)
     
     # Use the same generate_dataset method as training script
     X, y = generator.generate_dataset(num_samples=samples, scenarios=["normal", "good", "poor", "critical"])
@@ -233,9 +230,9 @@ def main() -> int:
     args = parser.parse_args()
     
     model_dir = Path(args.model_dir)
-    if not (model_dir / "action_model.pkl").exists():
+    if not any((model_dir / name).exists() for name in ("action_model.ubj", "action_model.pkl")):
         raise SystemExit(
-            f"Missing {model_dir / 'action_model.pkl'}. "
+            f"Missing {model_dir / 'action_model.ubj'} (or legacy {model_dir / 'action_model.pkl'}). "
             f"Train models first: python train_xgboost_models.py"
         )
     
@@ -34,6 +34,24 @@ class AutoGluonDecisionAgent:
     making it ideal for quick deployment with good performance.
     """
     
+    FEATURE_NAMES = [
+        # Water Quality (10)
+        'ph', 'temperature', 'dissolved_oxygen', 'salinity', 'ammonia',
+        'nitrite', 'nitrate', 'turbidity', 'status_encoded', 'alert_count',
+        # Feed (7)
+        'shrimp_count', 'average_weight', 'feed_amount', 'feed_type_encoded',
+        'feeding_frequency', 'biomass', 'time_since_feeding',
+        # Energy (6)
+        'aerator_usage', 'pump_usage', 'heater_usage', 'total_energy',
+        'cost', 'energy_efficiency',
+        # Labor (5)
+        'time_spent', 'worker_count', 'labor_efficiency', 'tasks_completed',
+        'pending_tasks',
+        # Interaction (7)
+        'water_quality_risk', 'feed_efficiency', 'energy_risk',
+        'labor_risk', 'overall_health', 'urgency_indicator', 'resource_need'
+    ]
+    
     def __init__(self, model_dir: str = 'models/autogluon_models', use_pretrained: bool = True):
         """
         Initialize AutoGluon Decision Agent.
@@ -94,6 +112,10 @@ class AutoGluonDecisionAgent:
         """
         Prepare data in format for AutoGluon training.
         
+        Rows are aligned by index, one per water quality record; extra feed,
+        energy or labor records beyond that are ignored, while shorter lists
+        raise ValueError.
+        
         Args:
             water_quality_data: List of water quality data
             feed_data: List of feed data
@@ -104,8 +126,15 @@ class AutoGluonDecisionAgent:
         Returns:
             DataFrame ready for AutoGluon
         """
-        # Extract features for each pond
-        all_features = []
+        # Extract features for all ponds in one vectorized pass
+        n = len(water_quality_data)
+        features = self.feature_extractor.extract_features_batch(
+            water_quality_data,
+            feed_data[:n],
+            energy_data[:n],
+            labor_data[:n],
+            dtype=np.float64
+        )
         all_labels = {
             'action_type': [],
             'urgency': [],
@@ -113,28 +142,16 @@ class AutoGluonDecisionAgent:
             'feed_amount': []
         }
         
-        for i in range(len(water_quality_data)):
-            # Extract features for this pond
-            features = self.feature_extractor.extract_features(
-                [water_quality_data[i]],
-                [feed_data[i]],
-                [energy_data[i]],
-                [labor_data[i]]
-            )
-            
-            # Convert to dict with feature names
-            feature_dict = self._features_to_dict(features)
-            all_features.append(feature_dict)
-            
-            # Add labels if provided
-            if labels:
+        # Add labels if provided
+        if labels:
+            for i in range(len(water_quality_data)):
                 all_labels['action_type'].append(labels.get('action_type', [0])[i] if isinstance(labels.get('action_type'), list) else labels.get('action_type', 0))
                 all_labels['urgency'].append(labels.get('urgency', [0.5])[i] if isinstance(labels.get('urgency'), list) else labels.get('urgency', 0.5))
                 all_labels['priority'].append(labels.get('priority', [1])[i] if isinstance(labels.get('priority'), list) else labels.get('priority', 1))
                 all_labels['feed_amount'].append(labels.get('feed_amount', [10.0])[i] if isinstance(labels.get('feed_amount'), list) else labels.get('feed_amount', 10.0))
         
         # Create DataFrame
-        df = pd.DataFrame(all_features)
+        df = pd.DataFrame(features, columns=self.FEATURE_NAMES)
         
         # Add labels if provided
         if labels:
@@ -147,23 +164,7 @@ class AutoGluonDecisionAgent:
     
     def _features_to_dict(self, features: np.ndarray) -> Dict[str, float]:
         """Convert feature array to dictionary with named features"""
-        feature_names = [
-            # Water Quality (10)
-            'ph', 'temperature', 'dissolved_oxygen', 'salinity', 'ammonia',
-            'nitrite', 'nitrate', 'turbidity', 'status_encoded', 'alert_count',
-            # Feed (7)
-            'shrimp_count', 'average_weight', 'feed_amount', 'feed_type_encoded',
-            'feeding_frequency', 'biomass', 'time_since_feeding',
-            # Energy (6)
-            'aerator_usage', 'pump_usage', 'heater_usage', 'total_energy',
-            'cost', 'energy_efficiency',
-            # Labor (5)
-            'time_spent', 'worker_count', 'labor_efficiency', 'tasks_completed',
-            'pending_tasks',
-            # Interaction (7)
-            'water_quality_risk', 'feed_efficiency', 'energy_risk',
-            'labor_risk', 'overall_health', 'urgency_indicator', 'resource_need'
-        ]
+        feature_names = self.FEATURE_NAMES
         
         # Ensure features array matches expected length
         if len(features) != len(feature_names):
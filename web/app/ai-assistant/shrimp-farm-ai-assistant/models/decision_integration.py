@@ -5,7 +5,6 @@ This module provides a Decision Agent that uses the trained decision model
 to make operational decisions based on farm data.
 """
 
-import torch
 import numpy as np
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -18,6 +17,80 @@ from models.decision_model import DecisionMakingModel, FeatureExtractor
 from models.decision_outputs import DecisionOutput, MultiPondDecision, ActionType
 
 
+# Action index -> ActionType, using the same 0..7 IDs as the training labels.
+_RULE_ACTIONS = (
+    ActionType.NO_ACTION,
+    ActionType.INCREASE_AERATION,
+    ActionType.DECREASE_AERATION,
+    ActionType.WATER_EXCHANGE,
+    ActionType.ADJUST_FEED,
+    ActionType.EMERGENCY_RESPONSE,
+    ActionType.ALLOCATE_WORKERS,
+    ActionType.MONITOR_CLOSELY,
+)
+
+
+def _index_by_pond(items: list) -> dict:
+    """Map pond_id -> first item for that pond (same pick as a linear scan)"""
+    index = {}
+    for item in items:
+        index.setdefault(item.pond_id, item)
+    return index
+
+
+def _resolve_ponds(water_quality_data: List[WaterQualityData],
+                   feed_data: List[FeedData],
+                   energy_data: List[EnergyData],
+                   labor_data: List[LaborData]) -> List[tuple]:
+    """
+    Align the four data lists by pond.
+    
+    Returns one (pond_id, wq, feed, energy, labor) tuple per water quality
+    reading. Ponds missing from a list fall back to that list's first item.
+    """
+    feed_by_pond = _index_by_pond(feed_data)
+    energy_by_pond = _index_by_pond(energy_data)
+    labor_by_pond = _index_by_pond(labor_data)
+    return [
+        (
+            wq.pond_id,
+            wq,
+            feed_by_pond.get(wq.pond_id, feed_data[0]),
+            energy_by_pond.get(wq.pond_id, energy_data[0]),
+            labor_by_pond.get(wq.pond_id, labor_data[0]),
+        )
+        for wq in water_quality_data
+    ]
+
+
+def _rule_based_scores(do: np.ndarray, ammonia: np.ndarray, temperature: np.ndarray,
+                       energy_efficiency: np.ndarray, status: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the fallback decision rules over arrays of ponds.
+    
+    Each cascade is first-match-wins, in the same order as the training
+    label rules. `status` holds WaterQualityStatus values as strings.
+    """
+    critical = status == 'critical'
+    poor = status == 'poor'
+    fair = status == 'fair'
+    low_energy = energy_efficiency < 0.6
+    
+    action_rules = [do < 4.0, do < 5.0, ammonia > 0.3, ammonia > 0.2,
+                    critical, poor, low_energy, fair]
+    urgency_rules = [do < 4.0, do < 5.0, ammonia > 0.3, critical, poor, low_energy]
+    
+    return {
+        'action': np.select(action_rules, [5, 1, 3, 3, 5, 1, 6, 7], default=0),
+        'intensity': np.select(action_rules, [1.0, 0.8, 0.9, 0.6, 1.0, 0.5, 0.4, 0.3], default=0.0),
+        'urgency': np.select(urgency_rules, [1.0, 0.8, 0.9, 1.0, 0.6, 0.4], default=0.0),
+        'priority': np.select([critical, poor, fair], [1, 2, 3], default=4),
+        'aerator': np.select([do < 5.0, do > 7.0], [1.0, 0.3], default=0.5),
+        'pump': np.where(ammonia > 0.2, 0.8, 0.5),
+        'heater': np.select([temperature < 26, temperature < 27], [0.7, 0.4], default=0.0),
+    }
+
+
 class DecisionAgent:
     """
     Agent that uses the decision model to make operational decisions.
@@ -32,24 +105,28 @@ class DecisionAgent:
         """
         self.model_path = model_path or 'models/decision_model.pth'
         self.model = None
+        self._trained = False
         self.feature_extractor = FeatureExtractor()
         self.load_model()
     
     def load_model(self):
         """Load the trained decision model"""
+        self._trained = Path(self.model_path).exists()
+        if not self._trained:
+            print(f"Warning: Model not found at {self.model_path}")
+            print("Using rule-based fallback. Train the model first using train_decision_model()")
+            self.model = None
+            return
+        
         try:
-            if Path(self.model_path).exists():
-                self.model = DecisionMakingModel.load_model(self.model_path)
-                self.model.eval()
-                print(f"Decision model loaded from {self.model_path}")
-            else:
-                print(f"Warning: Model not found at {self.model_path}")
-                print("Using untrained model. Train the model first using train_decision_model()")
-                self.model = DecisionMakingModel()
+            self.model = DecisionMakingModel.load_model(self.model_path)
+            self.model.eval()
+            print(f"Decision model loaded from {self.model_path}")
         except Exception as e:
             print(f"Error loading model: {e}")
-            print("Using untrained model")
-            self.model = DecisionMakingModel()
+            print("Using rule-based fallback")
+            self._trained = False
+            self.model = None
     
     def make_decision(self, 
                      water_quality_data: List[WaterQualityData],
@@ -70,17 +147,6 @@ class DecisionAgent:
         Returns:
             DecisionOutput with recommendations
         """
-        # Extract features
-        features = self.feature_extractor.extract_features(
-            water_quality_data,
-            feed_data,
-            energy_data,
-            labor_data
-        )
-        
-        # Make prediction
-        predictions = self.model.predict(features)
-        
         # Get data for the specific pond or first pond
         if pond_id is None:
             pond_id = water_quality_data[0].pond_id if water_quality_data else 1
@@ -91,6 +157,31 @@ class DecisionAgent:
         energy = next((e for e in energy_data if e.pond_id == pond_id), energy_data[0])
         labor = next((l for l in labor_data if l.pond_id == pond_id), labor_data[0])
         
+        return self._make_decision_resolved(pond_id, wq, feed, energy, labor)
+    
+    def _make_decision_resolved(self, pond_id: int, wq: WaterQualityData,
+                                feed: FeedData, energy: EnergyData,
+                                labor: LaborData,
+                                timestamp: Optional[datetime] = None) -> DecisionOutput:
+        """
+        Make a decision for one pond whose data has already been looked up.
+        
+        `timestamp` lets multi-pond callers share one clock read; defaults to now.
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        
+        # Without a trained checkpoint the network output is meaningless, so
+        # skip feature extraction and the forward pass entirely.
+        if not self._trained:
+            return self._rule_based_decision(wq, feed, energy, labor, pond_id, timestamp)
+        
+        # Extract features
+        features = self.feature_extractor.extract_features([wq], [feed], [energy], [labor])
+        
+        # Make prediction
+        predictions = self.model.predict(features)
+        
         # Convert predictions to DecisionOutput
         action_type_idx = predictions['action_type']
         action_type = ActionType(list(ActionType)[action_type_idx].value) if action_type_idx < len(ActionType) else ActionType.NO_ACTION
@@ -138,7 +229,7 @@ class DecisionAgent:
         affected_factors = self._identify_factors(wq, feed, energy, labor)
         
         return DecisionOutput(
-            timestamp=datetime.now(),
+            timestamp=timestamp,
             pond_id=pond_id,
             primary_action=action_type,
             action_intensity=action_intensity,
@@ -169,15 +260,20 @@ class DecisionAgent:
         priorities = {}
         urgent_ponds = []
         
+        # One timestamp for the whole pass
+        now = datetime.now()
+        
+        # Look up each pond's data once instead of scanning the lists per pond
+        ponds = _resolve_ponds(water_quality_data, feed_data, energy_data, labor_data)
+        
         # Make decision for each pond
-        for pond_id in [wq.pond_id for wq in water_quality_data]:
-            decision = self.make_decision(
-                water_quality_data,
-                feed_data,
-                energy_data,
-                labor_data,
-                pond_id=pond_id
-            )
+        if not self._trained:
+            pond_decisions = self._rule_based_decisions(ponds, now)
+        else:
+            pond_decisions = [self._make_decision_resolved(*pond, timestamp=now) for pond in ponds]
+        
+        for decision in pond_decisions:
+            pond_id = decision.pond_id
             decisions[pond_id] = decision
             priorities[pond_id] = decision.priority_rank
             
@@ -198,7 +294,7 @@ class DecisionAgent:
                 resource_allocation[f"pond_{pond_id}"] = decision.urgency_score / total_urgency
         
         return MultiPondDecision(
-            timestamp=datetime.now(),
+            timestamp=now,
             pond_priorities=sorted_priorities,
             urgent_ponds=urgent_ponds,
             recommended_actions=decisions,
@@ -206,6 +302,67 @@ class DecisionAgent:
             resource_allocation=resource_allocation
         )
     
+    def _rule_based_decision(self, wq: WaterQualityData, feed: FeedData,
+                             energy: EnergyData, labor: LaborData,
+                             pond_id: int,
+                             timestamp: Optional[datetime] = None) -> DecisionOutput:
+        """
+        Derive a decision directly from domain thresholds.
+        
+        Used when no trained model is available. Mirrors the rules the
+        training labels are generated from, so the output matches what a
+        well-trained model is expected to produce.
+        """
+        return self._rule_based_decisions([(pond_id, wq, feed, energy, labor)], timestamp)[0]
+    
+    def _rule_based_decisions(self, ponds: List[tuple],
+                              timestamp: Optional[datetime] = None) -> List[DecisionOutput]:
+        """
+        Rule-based fallback for many ponds in one vectorized pass.
+        
+        Args:
+            ponds: List of (pond_id, wq, feed, energy, labor) tuples
+            timestamp: Timestamp shared by all decisions (defaults to now)
+            
+        Returns:
+            One DecisionOutput per input tuple, in the same order
+        """
+        n = len(ponds)
+        do = np.fromiter((p[1].dissolved_oxygen for p in ponds), dtype=np.float64, count=n)
+        ammonia = np.fromiter((p[1].ammonia for p in ponds), dtype=np.float64, count=n)
+        temperature = np.fromiter((p[1].temperature for p in ponds), dtype=np.float64, count=n)
+        energy_efficiency = np.fromiter((p[3].efficiency_score for p in ponds), dtype=np.float64, count=n)
+        status = np.array([p[1].status.value for p in ponds])
+        
+        scores = _rule_based_scores(do, ammonia, temperature, energy_efficiency, status)
+        confidence = np.clip(0.6 + scores['urgency'] * 0.25, 0.6, 0.85)
+        
+        if timestamp is None:
+            timestamp = datetime.now()
+        decisions = []
+        for i, (pond_id, wq, feed, energy, labor) in enumerate(ponds):
+            action_type = _RULE_ACTIONS[scores['action'][i]]
+            urgency_score = float(scores['urgency'][i])
+            decisions.append(DecisionOutput(
+                timestamp=timestamp,
+                pond_id=pond_id,
+                primary_action=action_type,
+                action_intensity=float(scores['intensity'][i]),
+                secondary_actions=[],
+                priority_rank=int(scores['priority'][i]),
+                urgency_score=urgency_score,
+                recommended_feed_amount=float(feed.feed_amount),
+                recommended_aerator_level=float(scores['aerator'][i]),
+                recommended_pump_level=float(scores['pump'][i]),
+                recommended_heater_level=float(scores['heater'][i]),
+                confidence=float(confidence[i]),
+                reasoning=self._generate_reasoning(
+                    wq, feed, energy, labor, action_type, urgency_score
+                ),
+                affected_factors=self._identify_factors(wq, feed, energy, labor)
+            ))
+        return decisions
+    
     def _generate_reasoning(self, wq: WaterQualityData, feed: FeedData,
                            energy: EnergyData, labor: LaborData,
                            action_type: ActionType, urgency: float) -> str:
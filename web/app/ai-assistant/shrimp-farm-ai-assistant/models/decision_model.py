@@ -4,7 +4,7 @@ Decision Model - Feature Extraction and Decision Making
 This module provides feature extraction from farm data for ML models.
 """
 
-from typing import List
+from typing import Dict, List
 import numpy as np
 from pathlib import Path
 import importlib.util
@@ -38,6 +38,15 @@ class FeatureExtractor:
     Total: 35 features
     """
     
+    # Encode status as numeric (excellent=5, good=4, fair=3, poor=2, critical=1)
+    STATUS_ENCODING = {
+        WaterQualityStatus.EXCELLENT: 5.0,
+        WaterQualityStatus.GOOD: 4.0,
+        WaterQualityStatus.FAIR: 3.0,
+        WaterQualityStatus.POOR: 2.0,
+        WaterQualityStatus.CRITICAL: 1.0,
+    }
+    
     @staticmethod
     def extract_features(
         water_quality_data: List[WaterQualityData],
@@ -83,15 +92,9 @@ class FeatureExtractor:
         features.append(float(wq.nitrate))
         features.append(float(wq.turbidity))
         
-        # Encode status as numeric (excellent=5, good=4, fair=3, poor=2, critical=1)
-        status_map = {
-            WaterQualityStatus.EXCELLENT: 5.0,
-            WaterQualityStatus.GOOD: 4.0,
-            WaterQualityStatus.FAIR: 3.0,
-            WaterQualityStatus.POOR: 2.0,
-            WaterQualityStatus.CRITICAL: 1.0,
-        }
-        features.append(status_map.get(wq.status, 3.0))
+        # Encode status as numeric
+        status_encoded = FeatureExtractor.STATUS_ENCODING.get(wq.status, 3.0)
+        features.append(status_encoded)
         
         # 10-14: Feed Features (5 features)
         features.append(float(feed.shrimp_count))
@@ -138,7 +141,7 @@ class FeatureExtractor:
         
         # Energy efficiency relative to water quality
         # Lower efficiency when water quality is poor
-        wq_score = status_map.get(wq.status, 3.0) / 5.0
+        wq_score = status_encoded / 5.0
         features.append(float(energy.efficiency_score * wq_score))
         
         # Feed per biomass ratio
@@ -146,6 +149,148 @@ class FeatureExtractor:
         
         assert len(features) == 35, f"Expected 35 features, got {len(features)}"
         return features
+    
+    @staticmethod
+    def extract_features_batch(
+        water_quality_data: List[WaterQualityData],
+        feed_data: List[FeedData],
+        energy_data: List[EnergyData],
+        labor_data: List[LaborData],
+        dtype=np.float32
+    ) -> np.ndarray:
+        """
+        Extract features for many ponds/samples at once.
+        
+        The four lists are aligned by position: row i of the result is built
+        from the i-th item of each list. Columns match `extract_features`, but
+        are computed column-wise with NumPy instead of per item in Python.
+        
+        Args:
+            water_quality_data: List of WaterQualityData objects
+            feed_data: List of FeedData objects
+            energy_data: List of EnergyData objects
+            labor_data: List of LaborData objects
+            dtype: Output dtype (float32 matches what the tree models consume)
+        
+        Returns:
+            (N, 35) feature array
+        """
+        n = len(water_quality_data)
+        if not (len(feed_data) == len(energy_data) == len(labor_data) == n):
+            raise ValueError("All data lists must have the same length")
+        
+        def column(items, attr):
+            return np.fromiter((getattr(item, attr) for item in items), dtype=np.float64, count=n)
+        
+        def count(items, attr):
+            return np.fromiter((len(getattr(item, attr)) for item in items), dtype=np.float64, count=n)
+        
+        columns = {
+            'ph': column(water_quality_data, 'ph'),
+            'temperature': column(water_quality_data, 'temperature'),
+            'dissolved_oxygen': column(water_quality_data, 'dissolved_oxygen'),
+            'salinity': column(water_quality_data, 'salinity'),
+            'ammonia': column(water_quality_data, 'ammonia'),
+            'nitrite': column(water_quality_data, 'nitrite'),
+            'nitrate': column(water_quality_data, 'nitrate'),
+            'turbidity': column(water_quality_data, 'turbidity'),
+            'status_encoded': np.fromiter(
+                (FeatureExtractor.STATUS_ENCODING.get(w.status, 3.0) for w in water_quality_data),
+                dtype=np.float64, count=n
+            ),
+            'alert_count': count(water_quality_data, 'alerts'),
+            'shrimp_count': column(feed_data, 'shrimp_count'),
+            'average_weight': column(feed_data, 'average_weight'),
+            'feed_amount': column(feed_data, 'feed_amount'),
+            'feeding_frequency': column(feed_data, 'feeding_frequency'),
+            'aerator_usage': column(energy_data, 'aerator_usage'),
+            'pump_usage': column(energy_data, 'pump_usage'),
+            'heater_usage': column(energy_data, 'heater_usage'),
+            'total_energy': column(energy_data, 'total_energy'),
+            'cost': column(energy_data, 'cost'),
+            'energy_efficiency': column(energy_data, 'efficiency_score'),
+            'time_spent': column(labor_data, 'time_spent'),
+            'worker_count': column(labor_data, 'worker_count'),
+            'labor_efficiency': column(labor_data, 'efficiency_score'),
+            'tasks_completed': count(labor_data, 'tasks_completed'),
+            'next_tasks': count(labor_data, 'next_tasks'),
+        }
+        return FeatureExtractor.features_from_columns(columns, dtype=dtype)
+    
+    @staticmethod
+    def features_from_columns(columns: Dict[str, np.ndarray], dtype=np.float32) -> np.ndarray:
+        """
+        Build the (N, 35) feature matrix from raw per-pond columns.
+        
+        Lets callers that already hold NumPy arrays (e.g. the training data
+        generator) skip building data model objects. Expected keys are the
+        raw inputs gathered by `extract_features_batch`; `status_encoded`
+        uses STATUS_ENCODING and the list-valued fields are passed as counts
+        (`alert_count`, `tasks_completed`, `next_tasks`).
+        
+        Args:
+            columns: Mapping of column name to 1-D array of length N
+            dtype: Output dtype
+        
+        Returns:
+            (N, 35) feature array
+        """
+        ph = columns['ph']
+        temperature = columns['temperature']
+        do = columns['dissolved_oxygen']
+        ammonia = columns['ammonia']
+        status = columns['status_encoded']
+        shrimp_count = columns['shrimp_count']
+        average_weight = columns['average_weight']
+        feed_amount = columns['feed_amount']
+        energy_efficiency = columns['energy_efficiency']
+        biomass = shrimp_count * average_weight / 1000.0
+        
+        features_by_column = [
+            # 1-9: Water Quality Features
+            ph, temperature, do,
+            columns['salinity'],
+            ammonia,
+            columns['nitrite'],
+            columns['nitrate'],
+            columns['turbidity'],
+            status,
+            # 10-14: Feed Features
+            shrimp_count, average_weight, feed_amount,
+            columns['feeding_frequency'],
+            biomass,
+            # 15-20: Energy Features
+            columns['aerator_usage'],
+            columns['pump_usage'],
+            columns['heater_usage'],
+            columns['total_energy'],
+            columns['cost'],
+            energy_efficiency,
+            # 21-25: Labor Features
+            columns['time_spent'],
+            columns['worker_count'],
+            columns['labor_efficiency'],
+            columns['tasks_completed'],
+            columns['next_tasks'],
+            # 26-35: Derived/Interaction Features (branchless masks)
+            do < 5.0,
+            do < 4.0,
+            ammonia > 0.2,
+            ammonia > 0.3,
+            temperature < 26.0,
+            temperature > 30.0,
+            (ph < 7.5) | (ph > 8.5),
+            columns['alert_count'],
+            energy_efficiency * (status / 5.0),
+            feed_amount / np.maximum(biomass, 0.001),
+        ]
+        
+        features = np.empty((len(ph), len(features_by_column)), dtype=dtype)
+        for j, values in enumerate(features_by_column):
+            features[:, j] = values
+        
+        assert features.shape[1] == 35, f"Expected 35 features, got {features.shape[1]}"
+        return features
 
 
 class DecisionMakingModel:
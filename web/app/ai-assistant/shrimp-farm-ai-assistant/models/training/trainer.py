@@ -4,8 +4,9 @@ Training Script for Decision Model
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader, random_split
+from torch.utils.data import Dataset, DataLoader
 import numpy as np
 from pathlib import Path
 import json
@@ -15,45 +16,135 @@ from models.decision_model import DecisionMakingModel
 from models.training.data_generator import TrainingDataGenerator
 
 
+# Column layout of the packed float label tensor built by DecisionDataset
+# (action_type is a class index and is kept in its own int64 tensor)
+LABEL_SLICES = {
+    'action_intensity': slice(0, 8),
+    'priority': slice(8, 16),
+    'urgency': slice(16, 17),
+    'feed_amount': slice(17, 18),
+    'equipment_schedule': slice(18, 21),
+}
+
+# Loss weight per regression head, in packed label order
+REGRESSION_LOSS_WEIGHTS = {
+    'action_intensity': 1.0,
+    'priority': 1.5,
+    'urgency': 1.5,
+    'feed_amount': 1.0,
+    'equipment_schedule': 1.0,
+}
+
+
+# Regression heads occupy one contiguous run of packed columns, in loss-weight order
+_REGRESSION_HEADS = list(REGRESSION_LOSS_WEIGHTS)
+assert all(
+    LABEL_SLICES[prev].stop == LABEL_SLICES[name].start
+    for prev, name in zip(_REGRESSION_HEADS, _REGRESSION_HEADS[1:])
+), "REGRESSION_LOSS_WEIGHTS must follow the packed column order in LABEL_SLICES"
+REGRESSION_COLUMNS = slice(LABEL_SLICES[_REGRESSION_HEADS[0]].start, LABEL_SLICES[_REGRESSION_HEADS[-1]].stop)
+
+
+def unpack_labels(action_type: torch.Tensor, packed: torch.Tensor) -> Dict[str, torch.Tensor]:
+    """Split a packed label tensor back into per-head targets (single columns become 1-D)"""
+    labels = {'action_type': action_type}
+    for name, columns in LABEL_SLICES.items():
+        head = packed[:, columns]
+        labels[name] = head.squeeze(1) if columns.stop - columns.start == 1 else head
+    return labels
+
+
 class DecisionDataset(Dataset):
-    """Dataset for decision model training"""
+    """
+    Dataset for decision model training.
     
-    def __init__(self, features: np.ndarray, labels: Dict[str, np.ndarray]):
-        self.features = torch.tensor(features, dtype=torch.float32)
-        self.labels = {
-            'action_type': torch.tensor(labels['action_type'], dtype=torch.long),
-            'action_intensity': torch.tensor(labels['action_intensity'], dtype=torch.float32),
-            'priority': torch.tensor(labels['priority'], dtype=torch.float32),
-            'urgency': torch.tensor(labels['urgency'], dtype=torch.float32),
-            'feed_amount': torch.tensor(labels['feed_amount'], dtype=torch.float32),
-            'equipment_schedule': torch.tensor(labels['equipment_schedule'], dtype=torch.float32)
-        }
+    action_type stays an int64 tensor; the float labels are packed into one
+    tensor (see LABEL_SLICES) so the default collate stacks three tensors per
+    batch instead of walking a dict.
+    """
+    
+    def __init__(self, features: np.ndarray, labels: Dict[str, np.ndarray], device='cpu'):
+        # generate_dataset already returns float32 features and int64 action_type,
+        # so from_numpy shares their memory on CPU instead of copying
+        # (ascontiguousarray is a no-op in that case). torch.cat copies the float
+        # heads into the packed tensor.
+        def as_tensor(array: np.ndarray, dtype=np.float32) -> torch.Tensor:
+            return torch.from_numpy(np.ascontiguousarray(array, dtype=dtype))
+        
+        self.features = as_tensor(features).to(device)
+        self.action_type = as_tensor(labels['action_type'], np.int64).to(device)
+        self.labels = torch.cat([
+            as_tensor(labels['action_intensity']),
+            as_tensor(labels['priority']),
+            as_tensor(labels['urgency']).unsqueeze(1),
+            as_tensor(labels['feed_amount']).unsqueeze(1),
+            as_tensor(labels['equipment_schedule'])
+        ], dim=1).to(device)
     
     def __len__(self):
         return len(self.features)
     
     def __getitem__(self, idx):
-        return {
-            'features': self.features[idx],
-            'labels': {k: v[idx] for k, v in self.labels.items()}
-        }
+        return self.features[idx], self.action_type[idx], self.labels[idx]
+
+
+class DeviceBatchLoader:
+    """
+    DataLoader replacement for datasets that fit in device memory.
+    
+    Batches are cut from tensors that already live on the training device
+    by indexing with a torch.randperm permutation, so there is no per-item
+    __getitem__ dispatch, collate, or host-to-device copy per batch.
+    """
+    
+    def __init__(self, features: torch.Tensor, action_type: torch.Tensor, labels: torch.Tensor,
+                 batch_size: int = 32, shuffle: bool = False):
+        self.features = features
+        self.action_type = action_type
+        self.labels = labels
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+    
+    def __len__(self):
+        return (len(self.features) + self.batch_size - 1) // self.batch_size
+    
+    def __iter__(self):
+        n = len(self.features)
+        if self.shuffle:
+            order = torch.randperm(n, device=self.features.device)
+            for start in range(0, n, self.batch_size):
+                idx = order[start:start + self.batch_size]
+                yield self.features[idx], self.action_type[idx], self.labels[idx]
+        else:
+            for start in range(0, n, self.batch_size):
+                end = start + self.batch_size
+                yield self.features[start:end], self.action_type[start:end], self.labels[start:end]
 
 
 class DecisionModelTrainer:
     """Trainer for the decision model"""
     
-    def __init__(self, model: DecisionMakingModel, device='cpu'):
+    def __init__(self, model: DecisionMakingModel, device='cpu', compile_model: bool = False):
         self.model = model
         self.device = device
         self.model.to(device)
         
-        # Loss functions
+        # Optional compiled forward for the train/val loops (torch>=2.0); self.model
+        # stays the eager module so save_model and state_dict keys are unchanged.
+        # torch.compile is lazy, so failures surface on the first call (see _forward).
+        self.compiled_model = self.model
+        if compile_model and hasattr(torch, 'compile'):
+            self.compiled_model = torch.compile(self.model)
+        
+        # Loss functions: cross-entropy on the action head, one fused weighted
+        # MSE over the regression heads. Each head's weight is spread over its
+        # columns so the sum equals the per-head weighted means.
         self.action_type_loss = nn.CrossEntropyLoss()
-        self.action_intensity_loss = nn.MSELoss()
-        self.priority_loss = nn.MSELoss()
-        self.urgency_loss = nn.MSELoss()
-        self.feed_amount_loss = nn.MSELoss()
-        self.equipment_schedule_loss = nn.MSELoss()
+        column_weights = []
+        for name, weight in REGRESSION_LOSS_WEIGHTS.items():
+            width = LABEL_SLICES[name].stop - LABEL_SLICES[name].start
+            column_weights.extend([weight / width] * width)
+        self.regression_weights = torch.tensor(column_weights, dtype=torch.float32, device=device)
         
         # Optimizer
         self.optimizer = optim.Adam(model.parameters(), lr=0.001, weight_decay=1e-5)
@@ -69,6 +160,25 @@ class DecisionModelTrainer:
             'urgency_mae': []
         }
     
+    def _compute_loss(self, outputs: Dict[str, torch.Tensor], labels: Dict[str, torch.Tensor],
+                      packed_labels: torch.Tensor) -> torch.Tensor:
+        """Weighted combined loss; regression targets are the REGRESSION_COLUMNS of the packed labels"""
+        preds = torch.cat([outputs[name] for name in REGRESSION_LOSS_WEIGHTS], dim=1)
+        squared_error = F.mse_loss(preds, packed_labels[:, REGRESSION_COLUMNS], reduction='none')
+        regression_loss = (squared_error * self.regression_weights).sum(dim=1).mean()
+        return self.action_type_loss(outputs['action_type'], labels['action_type']) * 2.0 + regression_loss
+    
+    def _forward(self, features: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """Forward pass through the compiled model, falling back to eager if compilation fails"""
+        if self.compiled_model is self.model:
+            return self.model(features)
+        try:
+            return self.compiled_model(features)
+        except Exception as e:
+            print(f"torch.compile failed, continuing eagerly: {e}")
+            self.compiled_model = self.model
+            return self.model(features)
+    
     def train_epoch(self, train_loader: DataLoader) -> Dict[str, float]:
         """Train for one epoch"""
         self.model.train()
@@ -76,41 +186,22 @@ class DecisionModelTrainer:
         action_correct = 0
         action_total = 0
         
-        for batch in train_loader:
-            features = batch['features'].to(self.device)
-            labels = {k: v.to(self.device) for k, v in batch['labels'].items()}
+        for features, action_type, packed_labels in train_loader:
+            features = features.to(self.device)
+            action_type = action_type.to(self.device)
+            packed_labels = packed_labels.to(self.device)
+            labels = unpack_labels(action_type, packed_labels)
             
             # Forward pass
-            outputs = self.model(features)
-            
-            # Calculate losses
-            action_type_loss = self.action_type_loss(outputs['action_type'], labels['action_type'])
-            action_intensity_loss = self.action_intensity_loss(
-                outputs['action_intensity'], labels['action_intensity']
-            )
-            priority_loss = self.priority_loss(outputs['priority'], labels['priority'])
-            urgency_loss = self.urgency_loss(outputs['urgency'], labels['urgency'].unsqueeze(1))
-            feed_amount_loss = self.feed_amount_loss(
-                outputs['feed_amount'], labels['feed_amount'].unsqueeze(1)
-            )
-            equipment_schedule_loss = self.equipment_schedule_loss(
-                outputs['equipment_schedule'], labels['equipment_schedule']
-            )
+            outputs = self._forward(features)
             
             # Combined loss (weighted)
-            loss = (
-                action_type_loss * 2.0 +
-                action_intensity_loss * 1.0 +
-                priority_loss * 1.5 +
-                urgency_loss * 1.5 +
-                feed_amount_loss * 1.0 +
-                equipment_schedule_loss * 1.0
-            )
+            loss = self._compute_loss(outputs, labels, packed_labels)
             
             # Backward pass
-            self.optimizer.zero_grad()
+            self.optimizer.zero_grad(set_to_none=True)
             loss.backward()
-            torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
+            torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0, foreach=True)
             self.optimizer.step()
             
             total_loss += loss.item()
@@ -134,37 +225,18 @@ class DecisionModelTrainer:
         total_loss = 0.0
         action_correct = 0
         action_total = 0
-        urgency_errors = []
+        urgency_error_sum = torch.zeros((), device=self.device)
         
-        with torch.no_grad():
-            for batch in val_loader:
-                features = batch['features'].to(self.device)
-                labels = {k: v.to(self.device) for k, v in batch['labels'].items()}
-                
-                outputs = self.model(features)
+        with torch.inference_mode():
+            for features, action_type, packed_labels in val_loader:
+                features = features.to(self.device)
+                action_type = action_type.to(self.device)
+                packed_labels = packed_labels.to(self.device)
+                labels = unpack_labels(action_type, packed_labels)
                 
-                # Calculate losses
-                action_type_loss = self.action_type_loss(outputs['action_type'], labels['action_type'])
-                action_intensity_loss = self.action_intensity_loss(
-                    outputs['action_intensity'], labels['action_intensity']
-                )
-                priority_loss = self.priority_loss(outputs['priority'], labels['priority'])
-                urgency_loss = self.urgency_loss(outputs['urgency'], labels['urgency'].unsqueeze(1))
-                feed_amount_loss = self.feed_amount_loss(
-                    outputs['feed_amount'], labels['feed_amount'].unsqueeze(1)
-                )
-                equipment_schedule_loss = self.equipment_schedule_loss(
-                    outputs['equipment_schedule'], labels['equipment_schedule']
-                )
+                outputs = self._forward(features)
                 
-                loss = (
-                    action_type_loss * 2.0 +
-                    action_intensity_loss * 1.0 +
-                    priority_loss * 1.5 +
-                    urgency_loss * 1.5 +
-                    feed_amount_loss * 1.0 +
-                    equipment_schedule_loss * 1.0
-                )
+                loss = self._compute_loss(outputs, labels, packed_labels)
                 
                 total_loss += loss.item()
                 
@@ -172,13 +244,12 @@ class DecisionModelTrainer:
                 action_correct += (pred_actions == labels['action_type']).sum().item()
                 action_total += labels['action_type'].size(0)
                 
-                urgency_errors.extend(
-                    torch.abs(outputs['urgency'] - labels['urgency'].unsqueeze(1)).cpu().numpy()
-                )
+                # Accumulated on the device; synced once after the loop
+                urgency_error_sum += torch.abs(outputs['urgency'].squeeze(1) - labels['urgency']).sum()
         
         avg_loss = total_loss / len(val_loader)
         action_acc = action_correct / action_total if action_total > 0 else 0.0
-        urgency_mae = np.mean(urgency_errors) if urgency_errors else 0.0
+        urgency_mae = urgency_error_sum.item() / action_total if action_total > 0 else 0.0
         
         return {
             'loss': avg_loss,
@@ -242,8 +313,14 @@ class DecisionModelTrainer:
 
 
 def train_decision_model(num_samples: int = 10000, epochs: int = 100, 
-                        batch_size: int = 32, device: str = 'cpu'):
-    """Main training function"""
+                        batch_size: int = 32, device: str = 'cpu',
+                        compile_model: bool = False):
+    """
+    Main training function.
+    
+    compile_model runs the train/val forward passes through torch.compile
+    (falling back to eager if compilation fails).
+    """
     
     print("=" * 60)
     print("Decision Model Training")
@@ -259,18 +336,23 @@ def train_decision_model(num_samples: int = 10000, epochs: int = 100,
     print(f"   Generated {len(features)} samples")
     print(f"   Feature shape: {features.shape}")
     
-    # Create dataset
+    # Create dataset (small enough to live on the training device)
     print("\n2. Creating dataset...")
-    dataset = DecisionDataset(features, labels)
+    dataset = DecisionDataset(features, labels, device=device)
     
     # Split train/val
     train_size = int(0.8 * len(dataset))
     val_size = len(dataset) - train_size
-    train_dataset, val_dataset = random_split(dataset, [train_size, val_size])
+    split = torch.randperm(len(dataset), device=device)
+    train_idx, val_idx = split[:train_size], split[train_size:]
     
     # Create data loaders
-    train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False)
+    train_loader = DeviceBatchLoader(
+        dataset.features[train_idx], dataset.action_type[train_idx], dataset.labels[train_idx], batch_size=batch_size, shuffle=True
+    )
+    val_loader = DeviceBatchLoader(
+        dataset.features[val_idx], dataset.action_type[val_idx], dataset.labels[val_idx], batch_size=batch_size, shuffle=False
+    )
     
     print(f"   Train samples: {train_size}, Val samples: {val_size}")
     
@@ -281,7 +363,7 @@ def train_decision_model(num_samples: int = 10000, epochs: int = 100,
     
     # Create trainer
     print("\n4. Starting training...")
-    trainer = DecisionModelTrainer(model, device=device)
+    trainer = DecisionModelTrainer(model, device=device, compile_model=compile_model)
     
     # Train
     history = trainer.train(
@@ -309,6 +391,7 @@ if __name__ == "__main__":
     parser.add_argument('--epochs', type=int, default=100, help='Number of epochs')
     parser.add_argument('--batch-size', type=int, default=32, help='Batch size')
     parser.add_argument('--device', type=str, default='cpu', help='Device (cpu/cuda)')
+    parser.add_argument('--compile', action='store_true', help='Compile the model with torch.compile')
     
     args = parser.parse_args()
     
@@ -316,6 +399,7 @@ if __name__ == "__main__":
         num_samples=args.samples,
         epochs=args.epochs,
         batch_size=args.batch_size,
-        device=args.device
+        device=args.device,
+        compile_model=args.compile
     )
 
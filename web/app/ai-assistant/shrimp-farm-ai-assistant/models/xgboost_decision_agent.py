@@ -14,9 +14,13 @@ Compared to AutoGluon:
 
 from __future__ import annotations
 
+import asyncio
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 
 import numpy as np
@@ -51,6 +55,46 @@ except Exception:  # pragma: no cover
     OPENAI_MODEL_NAME = "gpt-4o-mini"
     OPENAI_TEMPERATURE = 0.2
 
+# Original action_type ID (0..7) -> ActionType
+_ACTION_BY_IDX = (
+    ActionType.NO_ACTION,
+    ActionType.INCREASE_AERATION,
+    ActionType.DECREASE_AERATION,
+    ActionType.WATER_EXCHANGE,
+    ActionType.ADJUST_FEED,
+    ActionType.EMERGENCY_RESPONSE,
+    ActionType.ALLOCATE_WORKERS,
+    ActionType.MONITOR_CLOSELY,
+)
+
+# Max LLM explanations kept per agent; see XGBoostDecisionAgent._reasoning_key
+REASONING_CACHE_SIZE = 4096
+# Feature rows whose model outputs are kept for unchanged readings
+PREDICTION_CACHE_SIZE = 1024
+
+# Max concurrent LLM requests when explaining a multi-pond batch
+REASONING_CONCURRENCY = 8
+
+# From MARSHAL_MIN_BATCH pending explanations up, decisions are explained
+# together in prompts of at most MARSHAL_MAX_BATCH instead of one each
+MARSHAL_MIN_BATCH = 4
+MARSHAL_MAX_BATCH = 20
+
+
+def _ratio_bucket(value: float) -> int:
+    """Logarithmic bucket of a non-negative quantity: neighbouring buckets differ by ~5%."""
+    return int(math.log1p(max(0.0, float(value))) / math.log(1.05))
+
+
+def _run_coroutine(coro):
+    """asyncio.run, moved to a worker thread when called from a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 
 class XGBoostDecisionAgent:
     """
@@ -76,9 +120,18 @@ class XGBoostDecisionAgent:
         self.action_model: Optional["xgb.XGBClassifier"] = None
         self.urgency_model: Optional["xgb.XGBRegressor"] = None
         self._enc_to_orig: Optional[Dict[int, int]] = None
-
-        # OpenAI LLM for enhanced explanations (optional)
+        # Encoded class -> original action ID as an array (built from _enc_to_orig)
+        self._enc_lut: Optional[np.ndarray] = None
+        # Raw boosters unwrapped from the sklearn estimators for inplace_predict
+        self._action_booster: Optional["xgb.Booster"] = None
+        self._urgency_booster: Optional["xgb.Booster"] = None
+        # Feature row bytes -> (action_id, urgency, max_proba), LRU order
+        self._prediction_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+        # OpenAI LLM for enhanced explanations (optional). Explanations are
+        # reused across decisions that fall in the same bucket (LRU order).
         self.llm: Optional[ChatOpenAI] = None
+        self._reasoning_cache: "OrderedDict[tuple, str]" = OrderedDict()
         self.enable_llm_explanations = enable_llm_explanations and OPENAI_AVAILABLE
         if self.enable_llm_explanations and OPENAI_API_KEY:
             try:
@@ -96,13 +149,25 @@ class XGBoostDecisionAgent:
         self._try_load_models()
 
     def _try_load_models(self) -> None:
-        action_path = self.model_dir / "action_model.pkl"
-        urgency_path = self.model_dir / "urgency_model.pkl"
+        action_path = self.model_dir / "action_model.ubj"
+        urgency_path = self.model_dir / "urgency_model.ubj"
+        legacy_action_path = self.model_dir / "action_model.pkl"
+        legacy_urgency_path = self.model_dir / "urgency_model.pkl"
         mapping_path = self.model_dir / "action_class_mapping.json"
 
         if action_path.exists() and urgency_path.exists():
-            self.action_model = joblib.load(action_path)
-            self.urgency_model = joblib.load(urgency_path)
+            self.action_model = xgb.XGBClassifier()
+            self.action_model.load_model(action_path)
+            self.urgency_model = xgb.XGBRegressor()
+            self.urgency_model.load_model(urgency_path)
+        elif legacy_action_path.exists() and legacy_urgency_path.exists():
+            # Models saved by older trainers as joblib pickles
+            self.action_model = joblib.load(legacy_action_path)
+            self.urgency_model = joblib.load(legacy_urgency_path)
+
+        if self.action_model is not None and self.urgency_model is not None:
+            self._action_booster = self._unwrap_booster(self.action_model)
+            self._urgency_booster = self._unwrap_booster(self.urgency_model)
 
             if mapping_path.exists():
                 try:
@@ -113,8 +178,20 @@ class XGBoostDecisionAgent:
                 except Exception:
                     self._enc_to_orig = None
 
+            if self._enc_to_orig:
+                # Unmapped encoded classes keep their own ID
+                size = max(len(getattr(self.action_model, "classes_", ())), max(self._enc_to_orig) + 1)
+                self._enc_lut = np.array([self._enc_to_orig.get(i, i) for i in range(size)], dtype=np.int64)
+
             self.is_trained = True
 
+    def _check_ready(self, water_quality_data, feed_data, energy_data, labor_data) -> None:
+        if not self.is_trained or self.action_model is None or self.urgency_model is None:
+            raise ValueError("XGBoost models not trained/loaded. Train with: python train_xgboost_models.py")
+
+        if not water_quality_data or not feed_data or not energy_data or not labor_data:
+            raise ValueError("All data lists must be non-empty")
+
     def make_decision(  
         self,
         water_quality_data: List[WaterQualityData],
@@ -122,12 +199,9 @@ class XGBoostDecisionAgent:
         energy_data: List[EnergyData],
         labor_data: List[LaborData],
         pond_id: Optional[int] = None,
+        timestamp: Optional[datetime] = None,
     ) -> DecisionOutput:
-        if not self.is_trained or self.action_model is None or self.urgency_model is None:
-            raise ValueError("XGBoost models not trained/loaded. Train with: python train_xgboost_models.py")
-
-        if not water_quality_data or not feed_data or not energy_data or not labor_data:
-            raise ValueError("All data lists must be non-empty")
+        self._check_ready(water_quality_data, feed_data, energy_data, labor_data)
 
         if pond_id is None:
             pond_id = water_quality_data[0].pond_id
@@ -137,48 +211,66 @@ class XGBoostDecisionAgent:
         energy = next((e for e in energy_data if e.pond_id == pond_id), energy_data[0])
         labor = next((l for l in labor_data if l.pond_id == pond_id), labor_data[0])
 
-        # FeatureExtractor returns a 35-float vector for a single pond.
-        x = self.feature_extractor.extract_features([wq], [feed], [energy], [labor])
-        x = np.asarray(x, dtype=np.float32).reshape(1, -1)
-
-        action_pred = int(self.action_model.predict(x)[0])
-        action_idx = int(self._enc_to_orig.get(action_pred, action_pred) if self._enc_to_orig else action_pred)
-        action_idx = max(0, min(7, action_idx))
-
-        urgency = float(self.urgency_model.predict(x)[0])
-        urgency = float(max(0.0, min(1.0, urgency)))
-
-        confidence = self._confidence(x, urgency)
-        primary_action = self._map_action(action_idx)
-
-        # Generate enhanced reasoning with OpenAI if available
-        reasoning = self._generate_reasoning(
-            primary_action=primary_action,
-            urgency=urgency,
-            confidence=confidence,
-            wq=wq,
-            feed=feed,
-            energy=energy,
-            labor=labor,
-        )
+        return self._decide_batch([(int(pond_id), wq, feed, energy, labor)], timestamp)[0]
 
-        return DecisionOutput(
-            timestamp=datetime.now(),
-            pond_id=int(pond_id),
-            primary_action=primary_action,
-            action_intensity=urgency,
-            secondary_actions=[],
-            priority_rank=1,  # overwritten in multi-pond pass
-            urgency_score=urgency,
-            # Keep optional optimization outputs unset for maximum simplicity.
-            recommended_feed_amount=None,
-            recommended_aerator_level=None,
-            recommended_pump_level=None,
-            recommended_heater_level=None,
-            confidence=confidence,
-            reasoning=reasoning,
-            affected_factors=self._affected_factors(wq, energy, labor),
-        )
+    def _extract_batch_features(
+        self,
+        wq_list: List[WaterQualityData],
+        feed_list: List[FeedData],
+        energy_list: List[EnergyData],
+        labor_list: List[LaborData],
+    ) -> np.ndarray:
+        """(N, 35) float32 feature matrix, one row per aligned (wq, feed, energy, labor)."""
+        x = self.feature_extractor.extract_features_batch(wq_list, feed_list, energy_list, labor_list)
+        return np.ascontiguousarray(x, dtype=np.float32)
+
+    def _decide_batch(
+        self,
+        rows: List[Tuple[int, WaterQualityData, FeedData, EnergyData, LaborData]],
+        timestamp: Optional[datetime] = None,
+    ) -> List[DecisionOutput]:
+        """
+        Decide for several ponds with one predict call per model.
+
+        `rows` holds (pond_id, wq, feed, energy, labor) per pond; decisions are
+        returned in the same order and share one timestamp (default: now).
+        """
+        timestamp = timestamp or datetime.now()
+        _, wq_list, feed_list, energy_list, labor_list = (list(col) for col in zip(*rows))
+        x = self._extract_batch_features(wq_list, feed_list, energy_list, labor_list)
+
+        predictions = self._predict_cached(x)
+
+        decisions: List[DecisionOutput] = []
+        contexts: List[tuple] = []
+        for (pond_id, wq, feed, energy, labor), (action_idx, urgency, max_proba) in zip(rows, predictions):
+            confidence = self._confidence(max_proba, urgency)
+            primary_action = self._map_action(action_idx)
+
+            # Every value is already cast and clamped above, so skip re-validation
+            decisions.append(DecisionOutput.model_construct(
+                timestamp=timestamp,
+                pond_id=pond_id,
+                primary_action=primary_action,
+                action_intensity=urgency,
+                secondary_actions=[],
+                priority_rank=1,  # overwritten in multi-pond pass
+                urgency_score=urgency,
+                # Keep optional optimization outputs unset for maximum simplicity.
+                recommended_feed_amount=None,
+                recommended_aerator_level=None,
+                recommended_pump_level=None,
+                recommended_heater_level=None,
+                confidence=confidence,
+                reasoning="",  # filled in below
+                affected_factors=self._affected_factors(wq, energy, labor),
+            ))
+            contexts.append((primary_action, urgency, confidence, wq, feed, energy, labor))
+
+        # Generate enhanced reasoning with OpenAI if available (concurrently across ponds)
+        for decision, reasoning in zip(decisions, self._generate_reasonings(contexts)):
+            decision.reasoning = reasoning
+        return decisions
 
     def make_multi_pond_decisions(
         self,
@@ -187,44 +279,61 @@ class XGBoostDecisionAgent:
         energy_data: List[EnergyData],
         labor_data: List[LaborData],
     ) -> MultiPondDecision:
+        now = datetime.now()
         decisions: Dict[int, DecisionOutput] = {}
 
         pond_ids = [wq.pond_id for wq in water_quality_data]
-        for pid in pond_ids:
-            decisions[pid] = self.make_decision(
-                water_quality_data=water_quality_data,
-                feed_data=feed_data,
-                energy_data=energy_data,
-                labor_data=labor_data,
-                pond_id=pid,
-            )
+        if pond_ids:
+            self._check_ready(water_quality_data, feed_data, energy_data, labor_data)
+            # pond_id -> first record for that pond (the pick make_decision's scans make);
+            # reversed() so earlier records overwrite later duplicates
+            wq_by_pid = {w.pond_id: w for w in reversed(water_quality_data)}
+            feed_by_pid = {f.pond_id: f for f in reversed(feed_data)}
+            energy_by_pid = {e.pond_id: e for e in reversed(energy_data)}
+            labor_by_pid = {l.pond_id: l for l in reversed(labor_data)}
+            rows = [
+                (
+                    int(pid),
+                    wq_by_pid[pid],
+                    feed_by_pid.get(pid, feed_data[0]),
+                    energy_by_pid.get(pid, energy_data[0]),
+                    labor_by_pid.get(pid, labor_data[0]),
+                )
+                for pid in pond_ids
+            ]
+
+            # One feature matrix and one predict call per model for all ponds
+            decisions = dict(zip(pond_ids, self._decide_batch(rows, now)))
 
         # Assign priority ranks: 1 = most urgent
         urgency_sorted = sorted(decisions.items(), key=lambda kv: kv[1].urgency_score, reverse=True)
         pond_priorities: Dict[int, int] = {}
         for rank, (pid, decision) in enumerate(urgency_sorted, start=1):
-            # Be robust across pydantic v1/v2: avoid relying on in-place mutation.
-            try:
-                decisions[pid] = decision.model_copy(update={"priority_rank": rank})  # pydantic v2
-            except Exception:
-                try:
-                    decisions[pid] = decision.copy(update={"priority_rank": rank})  # pydantic v1
-                except Exception:
-                    decision.priority_rank = rank  # last resort
-                    decisions[pid] = decision
+            # Decisions are freshly built and not shared, so set the rank in place
+            # (DecisionOutput does not validate on assignment in pydantic v1 or v2).
+            decision.priority_rank = rank
             pond_priorities[pid] = rank
 
-        urgent_ponds = [pid for pid, d in decisions.items() if d.urgency_score >= 0.7]
-        overall_urgency = max((d.urgency_score for d in decisions.values()), default=0.0)
+        # Urgent ponds, peak and total urgency in one pass (urgency is clamped to [0, 1])
+        urgent_ponds: List[int] = []
+        overall_urgency = 0.0
+        total_urgency = 0.0
+        for pid, d in decisions.items():
+            urgency = d.urgency_score
+            total_urgency += urgency
+            if urgency > overall_urgency:
+                overall_urgency = urgency
+            if urgency >= 0.7:
+                urgent_ponds.append(pid)
 
-        total_urgency = sum(d.urgency_score for d in decisions.values())
         resource_allocation: Dict[str, float] = {}
         if total_urgency > 0:
             for pid, d in decisions.items():
                 resource_allocation[f"pond_{pid}"] = d.urgency_score / total_urgency
 
-        return MultiPondDecision(
-            timestamp=datetime.now(),
+        # Parts come straight from _decide_batch; skip re-validating every nested decision
+        return MultiPondDecision.model_construct(
+            timestamp=now,
             pond_priorities=pond_priorities,
             urgent_ponds=urgent_ponds,
             recommended_actions=decisions,
@@ -232,27 +341,113 @@ class XGBoostDecisionAgent:
             resource_allocation=resource_allocation,
         )
 
-    def _confidence(self, x: np.ndarray, urgency: float) -> float:
+    def _predict_cached(self, x: np.ndarray) -> List[tuple]:
+        """
+        (action_id, urgency, max_proba) per row of `x`, clamped to valid ranges.
+
+        Dashboard refreshes mostly resend unchanged readings, so outputs are
+        memoized by the feature row and only new rows reach the models.
+        """
+        keys = [row.tobytes() for row in x]
+        predictions: List[Optional[tuple]] = []
+        misses: List[int] = []
+        for i, key in enumerate(keys):
+            cached = self._prediction_cache.get(key)
+            if cached is not None:
+                self._prediction_cache.move_to_end(key)
+            else:
+                misses.append(i)
+            predictions.append(cached)
+
+        if misses:
+            x_new = x[misses]
+            action_enc, action_conf = self._predict_actions(x_new)
+            action_ids = self._decode_actions(action_enc)
+            urgencies = np.clip(self._predict_urgencies(x_new), 0.0, 1.0)
+            for j, i in enumerate(misses):
+                predicted = (
+                    int(action_ids[j]),
+                    float(urgencies[j]),
+                    float(action_conf[j]) if action_conf is not None else None,
+                )
+                predictions[i] = predicted
+                self._prediction_cache[keys[i]] = predicted
+                if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                    self._prediction_cache.popitem(last=False)
+        return predictions  # type: ignore[return-value]
+
+    def _predict_actions(self, x: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Encoded action classes and their probabilities for each row of `x`.
+
+        The class is the argmax of predict_proba (what XGBClassifier.predict
+        returns), so one classifier call yields both prediction and confidence.
+        """
         try:
-            proba = self.action_model.predict_proba(x)  # type: ignore[union-attr]
-            return float(np.max(proba))
+            if self._action_booster is not None:
+                proba = self._inplace_predict(self._action_booster, self.action_model, x)
+                if proba.ndim == 1:
+                    # binary:logistic yields P(class 1) only
+                    proba = np.column_stack((1.0 - proba, proba))
+            else:
+                proba = self.action_model.predict_proba(x)  # type: ignore[union-attr]
         except Exception:
-            # Fallback: scale modestly with urgency (mirrors rule-based agents).
-            return float(max(0.6, min(0.85, 0.6 + urgency * 0.25)))
+            return self.action_model.predict(x), None  # type: ignore[union-attr]
+        return np.argmax(proba, axis=1), np.max(proba, axis=1)
+
+    def _predict_urgencies(self, x: np.ndarray) -> np.ndarray:
+        """Raw urgency regression output for each row of `x`."""
+        if self._urgency_booster is not None:
+            try:
+                return self._inplace_predict(self._urgency_booster, self.urgency_model, x)
+            except Exception:
+                pass
+        return self.urgency_model.predict(x)  # type: ignore[union-attr]
+
+    @staticmethod
+    def _unwrap_booster(model) -> Optional["xgb.Booster"]:
+        """Underlying Booster of a fitted sklearn estimator, or None if unavailable."""
+        try:
+            return model.get_booster()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _inplace_predict(booster: "xgb.Booster", model, x: np.ndarray) -> np.ndarray:
+        """
+        Predict straight from the float32 buffer, skipping DMatrix construction.
+
+        Mirrors the sklearn wrapper: same missing value and, when the model was
+        early-stopped, only the trees up to its best iteration.
+        """
+        best_iteration = getattr(model, "best_iteration", None)
+        iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+        return booster.inplace_predict(
+            x,
+            iteration_range=iteration_range,
+            missing=getattr(model, "missing", np.nan),
+        )
+
+    def _decode_actions(self, action_enc: np.ndarray) -> np.ndarray:
+        """Map encoded classes back to original action IDs, clamped to 0..7."""
+        action_ids = np.asarray(action_enc, dtype=np.int64)
+        if self._enc_lut is not None:
+            action_ids = self._enc_lut[np.clip(action_ids, 0, len(self._enc_lut) - 1)]
+        return np.clip(action_ids, 0, 7)
+
+    @staticmethod
+    def _confidence(max_proba: Optional[float], urgency: float) -> float:
+        if max_proba is not None:
+            return float(max_proba)
+        # Fallback: scale modestly with urgency (mirrors rule-based agents).
+        return float(max(0.6, min(0.85, 0.6 + urgency * 0.25)))
 
     @staticmethod
     def _map_action(action_idx: int) -> ActionType:
-        action_type_map = {
-            0: ActionType.NO_ACTION,
-            1: ActionType.INCREASE_AERATION,
-            2: ActionType.DECREASE_AERATION,
-            3: ActionType.WATER_EXCHANGE,
-            4: ActionType.ADJUST_FEED,
-            5: ActionType.EMERGENCY_RESPONSE,
-            6: ActionType.ALLOCATE_WORKERS,
-            7: ActionType.MONITOR_CLOSELY,
-        }
-        return action_type_map.get(int(action_idx), ActionType.NO_ACTION)
+        action_idx = int(action_idx)
+        if 0 <= action_idx < len(_ACTION_BY_IDX):
+            return _ACTION_BY_IDX[action_idx]
+        return ActionType.NO_ACTION
 
     def _generate_reasoning(
         self,
@@ -274,23 +469,14 @@ class XGBoostDecisionAgent:
                 primary_action, urgency, confidence, wq, feed, energy, labor
             )
 
-        try:
-            # Build context for LLM
-            context = self._build_decision_context(wq, feed, energy, labor)
-            
-            prompt = f"""You are an expert aquaculture specialist analyzing shrimp farm operations. 
-Based on the following data, provide a clear, actionable explanation for why the AI system recommended 
-the action "{primary_action.value}" with urgency {urgency:.2f} and confidence {confidence:.2f}.
-
-Context:
-{context}
-
-Provide a concise but comprehensive explanation (2-3 sentences) that:
-1. Explains the key factors that led to this decision
-2. Describes why this action is appropriate given the current conditions
-3. Mentions any specific parameters that triggered the recommendation
+        key = self._reasoning_key(primary_action, urgency, confidence, wq, feed, energy, labor)
+        cached = self._reasoning_cache.get(key)
+        if cached is not None:
+            self._reasoning_cache.move_to_end(key)
+            return cached
 
-Be professional, clear, and actionable. Focus on the most critical issues."""
+        try:
+            prompt = self._reasoning_prompt(primary_action, urgency, confidence, wq, feed, energy, labor)
 
             # Use invoke with a simple string message (compatible with both old and new langchain)
             try:
@@ -306,16 +492,9 @@ Be professional, clear, and actionable. Focus on the most critical issues."""
                     # Direct call as last resort
                     response = self.llm.invoke(prompt)
             
-            # Extract content from response
-            if hasattr(response, 'content'):
-                explanation = response.content.strip()
-            elif isinstance(response, str):
-                explanation = response.strip()
-            else:
-                explanation = str(response).strip()
-            
-            # Ensure we have a valid explanation
-            if explanation and len(explanation) > 20:
+            explanation = self._valid_explanation(response)
+            if explanation:
+                self._remember_reasoning(key, explanation)
                 return explanation
             else:
                 return self._generate_fallback_reasoning(
@@ -327,6 +506,202 @@ Be professional, clear, and actionable. Focus on the most critical issues."""
                 primary_action, urgency, confidence, wq, feed, energy, labor
             )
 
+    def _generate_reasonings(self, contexts: List[tuple]) -> List[str]:
+        """
+        Reasoning for several decisions; each context holds the
+        _generate_reasoning arguments in order.
+
+        Uncached buckets are sent to the LLM concurrently (one call per bucket,
+        or one per MARSHAL_MAX_BATCH buckets once there are MARSHAL_MIN_BATCH;
+        at most REASONING_CONCURRENCY in flight). Failed calls fall back to the
+        template explanation.
+        """
+        if not self.enable_llm_explanations or not self.llm or len(contexts) < 2:
+            return [self._generate_reasoning(*context) for context in contexts]
+
+        keys = [self._reasoning_key(*context) for context in contexts]
+        pending: Dict[tuple, tuple] = {}
+        for key, context in zip(keys, contexts):
+            if key not in self._reasoning_cache and key not in pending:
+                pending[key] = context
+
+        fetched: Dict[tuple, str] = {}
+        if pending:
+            try:
+                answers = _run_coroutine(self._gather_reasonings(list(pending.values())))
+            except Exception:
+                answers = [None] * len(pending)
+            for key, explanation in zip(pending, answers):
+                if explanation:
+                    fetched[key] = explanation
+                    self._remember_reasoning(key, explanation)
+
+        reasonings = []
+        for key, context in zip(keys, contexts):
+            explanation = fetched.get(key) or self._reasoning_cache.get(key)
+            reasonings.append(explanation or self._generate_fallback_reasoning(*context))
+        return reasonings
+
+    async def _gather_reasonings(self, contexts: List[tuple]) -> List[Optional[str]]:
+        """
+        Explain each context via `ainvoke`, bounded by a semaphore; None marks a failure.
+
+        Larger batches are row-marshaled into shared prompts; a group whose reply
+        cannot be parsed, or that misses entries, is retried one context at a time.
+        """
+        semaphore = asyncio.Semaphore(REASONING_CONCURRENCY)
+        try:
+            from langchain_core.messages import HumanMessage  # type: ignore
+        except Exception:
+            try:
+                from langchain.schema import HumanMessage  # type: ignore
+            except Exception:
+                HumanMessage = None
+
+        async def explain(context: tuple) -> Optional[str]:
+            prompt = self._reasoning_prompt(*context)
+            async with semaphore:
+                try:
+                    response = await self.llm.ainvoke(  # type: ignore[union-attr]
+                        [HumanMessage(content=prompt)] if HumanMessage else prompt
+                    )
+                except Exception:
+                    return None
+            return self._valid_explanation(response)
+
+        async def explain_group(group: List[tuple]) -> List[Optional[str]]:
+            prompt = self._marshaled_reasoning_prompt(group)
+            async with semaphore:
+                try:
+                    response = await self.llm.ainvoke(  # type: ignore[union-attr]
+                        [HumanMessage(content=prompt)] if HumanMessage else prompt
+                    )
+                    explanations = self._parse_marshaled_reasonings(response, len(group))
+                except Exception:
+                    explanations = [None] * len(group)
+            retries = [i for i, explanation in enumerate(explanations) if explanation is None]
+            for i, explanation in zip(retries, await asyncio.gather(*(explain(group[i]) for i in retries))):
+                explanations[i] = explanation
+            return explanations
+
+        if len(contexts) >= MARSHAL_MIN_BATCH:
+            groups = [contexts[i:i + MARSHAL_MAX_BATCH] for i in range(0, len(contexts), MARSHAL_MAX_BATCH)]
+            results = await asyncio.gather(*(explain_group(group) for group in groups))
+            return [explanation for group in results for explanation in group]
+        return await asyncio.gather(*(explain(context) for context in contexts))
+
+    def _reasoning_prompt(
+        self,
+        primary_action: ActionType,
+        urgency: float,
+        confidence: float,
+        wq: WaterQualityData,
+        feed: FeedData,
+        energy: EnergyData,
+        labor: LaborData,
+    ) -> str:
+        context = self._build_decision_context(wq, feed, energy, labor)
+        return f"""You are an expert aquaculture specialist analyzing shrimp farm operations. 
+Based on the following data, provide a clear, actionable explanation for why the AI system recommended 
+the action "{primary_action.value}" with urgency {urgency:.2f} and confidence {confidence:.2f}.
+
+Context:
+{context}
+
+Provide a concise but comprehensive explanation (2-3 sentences) that:
+1. Explains the key factors that led to this decision
+2. Describes why this action is appropriate given the current conditions
+3. Mentions any specific parameters that triggered the recommendation
+
+Be professional, clear, and actionable. Focus on the most critical issues."""
+
+    def _marshaled_reasoning_prompt(self, contexts: List[tuple]) -> str:
+        decisions = []
+        for number, (primary_action, urgency, confidence, wq, feed, energy, labor) in enumerate(contexts, start=1):
+            decisions.append(
+                f"""Decision {number}: action "{primary_action.value}" with urgency {urgency:.2f} and confidence {confidence:.2f}.
+Context:
+{self._build_decision_context(wq, feed, energy, labor)}"""
+            )
+        return f"""You are an expert aquaculture specialist analyzing shrimp farm operations. 
+For each numbered decision below, provide a clear, actionable explanation for why the AI system 
+recommended that action.
+
+Each explanation should be concise but comprehensive (2-3 sentences) and:
+1. Explain the key factors that led to the decision
+2. Describe why the action is appropriate given the current conditions
+3. Mention any specific parameters that triggered the recommendation
+
+Be professional, clear, and actionable. Focus on the most critical issues.
+
+Return only a JSON object mapping each decision number (as a string) to its explanation.
+
+""" + "\n\n".join(decisions)
+
+    @classmethod
+    def _parse_marshaled_reasonings(cls, response, count: int) -> List[Optional[str]]:
+        """Explanations 1..count from a marshaled reply; raises if it is not a JSON object."""
+        text = response.content if hasattr(response, 'content') else str(response)
+        # Tolerate code fences or prose around the object
+        payload = json.loads(text[text.index('{'):text.rindex('}') + 1])
+        return [cls._valid_explanation(str(payload.get(str(number), ""))) for number in range(1, count + 1)]
+
+    @staticmethod
+    def _valid_explanation(response) -> Optional[str]:
+        """Text of an LLM response, or None if it is too short to be useful."""
+        if hasattr(response, 'content'):
+            explanation = response.content.strip()
+        elif isinstance(response, str):
+            explanation = response.strip()
+        else:
+            explanation = str(response).strip()
+        return explanation if explanation and len(explanation) > 20 else None
+
+    def _remember_reasoning(self, key: tuple, explanation: str) -> None:
+        self._reasoning_cache[key] = explanation
+        if len(self._reasoning_cache) > REASONING_CACHE_SIZE:
+            self._reasoning_cache.popitem(last=False)
+
+    @staticmethod
+    def _reasoning_key(
+        primary_action: ActionType,
+        urgency: float,
+        confidence: float,
+        wq: WaterQualityData,
+        feed: Optional[FeedData],
+        energy: Optional[EnergyData],
+        labor: Optional[LaborData],
+    ) -> tuple:
+        """
+        Bucket for sharing LLM explanations between near-identical decisions.
+
+        Covers every reading the prompt quotes (see _build_decision_context), so
+        a reused explanation never cites another pond's numbers: action, status,
+        urgency and confidence in 0.1 steps, DO in 0.5 mg/L, ammonia and nitrite
+        in 0.05 mg/L, pH in 0.1, temperature and salinity in 1 unit, feed, weight
+        and stock in ~5% steps, efficiencies and equipment usage in 0.1, workers
+        and tasks exact.
+        """
+        key = [
+            primary_action.value,
+            wq.status.value,
+            int(urgency * 10),
+            int(confidence * 10),
+            int(wq.dissolved_oxygen * 2),
+            int(wq.ammonia * 20),
+            int(wq.nitrite * 20),
+            int(wq.ph * 10),
+            int(wq.temperature),
+            int(wq.salinity),
+        ]
+        if feed:
+            key += [_ratio_bucket(feed.feed_amount), _ratio_bucket(feed.average_weight), _ratio_bucket(feed.shrimp_count)]
+        if energy:
+            key += [int(energy.efficiency_score * 10), int(energy.aerator_usage * 10), int(energy.pump_usage * 10)]
+        if labor:
+            key += [int(labor.efficiency_score * 10), labor.worker_count, len(labor.next_tasks)]
+        return tuple(key)
+
     def _build_decision_context(
         self,
         wq: WaterQualityData,
@@ -3,6 +3,7 @@
 Quick start script for the Shrimp Farm Dashboard
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
@@ -11,21 +12,18 @@ def main():
     print("Starting Shrimp Farm Management Dashboard...")
     print("=" * 50)
     
-    # Check if streamlit is installed
-    try:
-        import streamlit
-    except ImportError:
+    # Check if streamlit is installed (find_spec locates it without importing)
+    if importlib.util.find_spec("streamlit") is None:
         print("Streamlit not found. Installing...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "streamlit"])
     
     # Check if required packages are installed
-    try:
-        import crewai
-        import langchain_openai
-        import pandas
-        import plotly
-    except ImportError as e:
-        print(f"Missing required package: {e}")
+    missing = [
+        package for package in ("crewai", "langchain_openai", "pandas", "plotly")
+        if importlib.util.find_spec(package) is None
+    ]
+    if missing:
+        print(f"Missing required packages: {', '.join(missing)}")
         print("Installing requirements...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
     
@@ -2,10 +2,42 @@
 Test MongoDB Atlas connection and display database information.
 """
 
+import asyncio
+from typing import Dict, List
+
 from pymongo import MongoClient
 from pymongo.server_api import ServerApi
 from config import MONGO_URI, MONGO_DB_NAME
-from database.mongodb import get_mongo_client, get_database, test_connection
+from database.mongodb import MOTOR_AVAILABLE, get_mongo_client, get_database, test_connection
+
+# Collections above this size skip the status $group (it scans every document)
+STATUS_SCAN_LIMIT = 100_000
+
+
+def count_documents(db, collections: List[str]) -> Dict[str, int]:
+    """
+    Document count per collection.
+    
+    Uses estimated_document_count (collection metadata, no scan). With motor
+    installed the counts are requested concurrently instead of one round-trip
+    per collection.
+    """
+    if MOTOR_AVAILABLE and collections:
+        from database.mongodb import get_async_mongo_client, get_async_database
+        
+        async def fetch_counts():
+            client = get_async_mongo_client()
+            try:
+                async_db = get_async_database(client)
+                return await asyncio.gather(
+                    *(async_db[col].estimated_document_count() for col in collections)
+                )
+            finally:
+                client.close()
+        
+        return dict(zip(collections, asyncio.run(fetch_counts())))
+    
+    return {col: db[col].estimated_document_count() for col in collections}
 
 def main():
     """Test MongoDB Atlas connection"""
@@ -50,10 +82,11 @@ def main():
         
         # List collections
         collections = db.list_collection_names()
+        counts = count_documents(db, collections)
         print(f"Collections in '{MONGO_DB_NAME}':")
         if collections:
             for col in collections:
-                count = db[col].count_documents({})
+                count = counts[col]
                 print(f"  - {col}: {count:,} documents")
                 
                 # Show sample document structure for water_quality_readings
@@ -69,8 +102,8 @@ def main():
         # Test query performance
         if "water_quality_readings" in collections:
             collection = db["water_quality_readings"]
-            count = collection.count_documents({})
-            if count > 0:
+            reading_count = counts["water_quality_readings"]
+            if reading_count > 0:
                 print("Query performance test:")
                 
                 # Test index usage
@@ -80,16 +113,19 @@ def main():
                 query_time = (time.time() - start) * 1000
                 print(f"  Latest 10 readings for Pond 1: {query_time:.2f}ms")
                 
-                # Status distribution
-                pipeline = [
-                    {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-                    {"$sort": {"count": -1}}
-                ]
-                status_dist = list(collection.aggregate(pipeline))
-                if status_dist:
-                    print("  Status distribution:")
-                    for item in status_dist:
-                        print(f"    {item['_id']}: {item['count']} documents")
+                # Status distribution (full collection scan, so only on small collections)
+                if reading_count >= STATUS_SCAN_LIMIT:
+                    print(f"  Status distribution: skipped (~{reading_count:,} documents)")
+                else:
+                    pipeline = [
+                        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1}}
+                    ]
+                    status_dist = list(collection.aggregate(pipeline))
+                    if status_dist:
+                        print("  Status distribution:")
+                        for item in status_dist:
+                            print(f"    {item['_id']}: {item['count']} documents")
         
         client.close()
         print()
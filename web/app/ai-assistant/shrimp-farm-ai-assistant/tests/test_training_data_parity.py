@@ -0,0 +1,106 @@
+"""
+Parity between the vectorized training-data path and the scalar one.
+
+generate_columns / generate_labels_batch / features_from_columns must agree
+with generate_*_data / generate_labels / extract_features on the same samples.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")  # models.training imports the torch trainer
+
+from models import WaterQualityData, WaterQualityStatus, FeedData
+from models.decision_model import FeatureExtractor
+from models.training.data_generator import TrainingDataGenerator, STATUS_CODES
+
+SEED = 7
+SCENARIOS = ["normal", "good", "poor", "critical", "unknown"] * 40
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return TrainingDataGenerator(seed=SEED)
+
+
+@pytest.fixture(scope="module")
+def columns(generator):
+    return generator.generate_columns(SCENARIOS)
+
+
+def scalar_sample(generator, columns, i):
+    """Rebuild row i as data model objects, deriving energy and labor with the scalar generators"""
+    now = datetime(2024, 1, 1)
+    row = {key: values[i] for key, values in columns.items()}
+    wq = WaterQualityData(
+        timestamp=now,
+        pond_id=1,
+        ph=row['ph'],
+        temperature=row['temperature'],
+        dissolved_oxygen=row['dissolved_oxygen'],
+        salinity=row['salinity'],
+        ammonia=row['ammonia'],
+        nitrite=row['nitrite'],
+        nitrate=row['nitrate'],
+        turbidity=row['turbidity'],
+        status=WaterQualityStatus(STATUS_NAMES[int(row['status_code'])]),
+        alerts=["alert"] * int(row['alert_count']),
+    )
+    feed = FeedData(
+        timestamp=now,
+        pond_id=1,
+        shrimp_count=int(row['shrimp_count']),
+        average_weight=row['average_weight'],
+        feed_amount=row['feed_amount'],
+        feed_type=generator.FEED_TYPES[1],
+        feeding_frequency=int(row['feeding_frequency']),
+        predicted_next_feeding=now,
+    )
+    energy = generator.generate_energy_data(1, wq)
+    labor = generator.generate_labor_data(1, wq, energy)
+    return wq, feed, energy, labor
+
+
+def test_columns_match_scalar_energy_and_labor(generator, columns):
+    for i in range(len(SCENARIOS)):
+        _, _, energy, labor = scalar_sample(generator, columns, i)
+        assert energy.aerator_usage == pytest.approx(columns['aerator_usage'][i])
+        assert energy.pump_usage == pytest.approx(columns['pump_usage'][i])
+        assert energy.heater_usage == pytest.approx(columns['heater_usage'][i])
+        assert energy.cost == pytest.approx(columns['cost'][i])
+        assert energy.efficiency_score == pytest.approx(columns['energy_efficiency'][i])
+        assert labor.time_spent == pytest.approx(columns['time_spent'][i])
+        assert labor.worker_count == columns['worker_count'][i]
+        assert labor.efficiency_score == pytest.approx(columns['labor_efficiency'][i])
+        assert len(labor.tasks_completed) == columns['tasks_completed'][i]
+        assert len(labor.next_tasks) == columns['next_tasks'][i]
+
+
+def test_features_from_columns_matches_extract_features(generator, columns):
+    batch = FeatureExtractor.features_from_columns(columns, dtype=np.float64)
+    assert batch.shape == (len(SCENARIOS), 35)
+    for i in range(len(SCENARIOS)):
+        scalar = FeatureExtractor.extract_features(*([item] for item in scalar_sample(generator, columns, i)))
+        np.testing.assert_allclose(batch[i], scalar, rtol=1e-12)
+
+
+def test_generate_labels_batch_matches_generate_labels(generator, columns):
+    batch = generator.generate_labels_batch(columns)
+    assert batch['action_type'].dtype == np.int64
+    for i in range(len(SCENARIOS)):
+        scalar = generator.generate_labels(*scalar_sample(generator, columns, i))
+        assert set(scalar) == set(batch)
+        for name, value in scalar.items():
+            np.testing.assert_allclose(batch[name][i], np.asarray(value), rtol=1e-6, err_msg=name)
+
+
+def test_generate_dataset_is_reproducible_for_a_seed():
+    features_a, labels_a = TrainingDataGenerator(seed=SEED).generate_dataset(num_samples=64)
+    features_b, labels_b = TrainingDataGenerator(seed=SEED).generate_dataset(num_samples=64)
+    assert features_a.dtype == np.float32
+    np.testing.assert_array_equal(features_a, features_b)
+    for name in labels_a:
+        np.testing.assert_array_equal(labels_a[name], labels_b[name])
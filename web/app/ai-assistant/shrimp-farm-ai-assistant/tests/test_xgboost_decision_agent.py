@@ -0,0 +1,262 @@
+"""
+Batch decisions, prediction caching and marshaled LLM explanations of
+XGBoostDecisionAgent, against small models fitted per test session.
+"""
+
+import asyncio
+import json
+import random
+import re
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+pytest.importorskip("joblib")
+pytest.importorskip("torch")  # models.training imports the torch trainer
+
+from models.decision_outputs import ActionType
+from models.training.data_generator import TrainingDataGenerator
+import models.xgboost_decision_agent as agent_module
+from models.xgboost_decision_agent import XGBoostDecisionAgent
+
+SEED = 11
+
+
+@pytest.fixture(scope="session")
+def model_dir(tmp_path_factory):
+    """Tiny action/urgency models saved the way train_xgboost_models.py saves them"""
+    out_dir = tmp_path_factory.mktemp("xgboost_models")
+    features, labels = TrainingDataGenerator(seed=SEED).generate_dataset(num_samples=600)
+    observed, action_enc = np.unique(labels['action_type'], return_inverse=True)
+
+    action_model = xgb.XGBClassifier(n_estimators=15, max_depth=3, tree_method="hist", random_state=SEED)
+    action_model.fit(features, action_enc)
+    action_model.save_model(out_dir / "action_model.ubj")
+    urgency_model = xgb.XGBRegressor(n_estimators=15, max_depth=3, tree_method="hist", random_state=SEED)
+    urgency_model.fit(features, labels['urgency'])
+    urgency_model.save_model(out_dir / "urgency_model.ubj")
+    (out_dir / "action_class_mapping.json").write_text(
+        json.dumps({"enc_to_orig": {i: int(orig) for i, orig in enumerate(observed)}}), encoding="utf-8"
+    )
+    return out_dir
+
+
+@pytest.fixture
+def agent(model_dir):
+    return XGBoostDecisionAgent(model_dir=str(model_dir), enable_llm_explanations=False)
+
+
+def make_ponds(count, seed=SEED):
+    generator = TrainingDataGenerator(seed=seed)
+    scenarios = random.Random(seed)
+    wq_list, feed_list, energy_list, labor_list = [], [], [], []
+    for pond_id in range(1, count + 1):
+        wq = generator.generate_water_quality_data(pond_id, scenarios.choice(["normal", "good", "poor", "critical"]))
+        energy = generator.generate_energy_data(pond_id, wq)
+        wq_list.append(wq)
+        feed_list.append(generator.generate_feed_data(pond_id, wq))
+        energy_list.append(energy)
+        labor_list.append(generator.generate_labor_data(pond_id, wq, energy))
+    return wq_list, feed_list, energy_list, labor_list
+
+
+def make_rows(ponds):
+    return [(wq.pond_id, wq, feed, energy, labor) for wq, feed, energy, labor in zip(*ponds)]
+
+
+def features_for(agent, ponds):
+    return agent._extract_batch_features(*ponds)
+
+
+class StubLLM:
+    """
+    Async chat model that echoes each decision's action and urgency back,
+    so a test can tell which context an explanation was written for.
+    """
+
+    class Reply:
+        def __init__(self, content):
+            self.content = content
+
+    def __init__(self, drop=()):
+        self.drop = set(drop)  # decision numbers left out of marshaled replies
+        self.single_calls = 0
+        self.marshaled_calls = 0
+
+    @staticmethod
+    def explanation(action, urgency):
+        return f"Recommended {action} because urgency is {urgency} for this pond."
+
+    async def ainvoke(self, messages):
+        prompt = messages[0].content if isinstance(messages, list) else messages
+        await asyncio.sleep(0)
+        decisions = re.findall(r'Decision (\d+): action "([^"]+)" with urgency ([\d.]+)', prompt)
+        if decisions:
+            self.marshaled_calls += 1
+            # Reverse the key order so the mapping has to follow the numbers
+            payload = {
+                number: self.explanation(action, urgency)
+                for number, action, urgency in reversed(decisions)
+                if int(number) not in self.drop
+            }
+            return self.Reply(f"```json\n{json.dumps(payload)}\n```")
+        self.single_calls += 1
+        action, urgency = re.search(r'the action "([^"]+)" with urgency ([\d.]+)', prompt).groups()
+        return self.Reply(self.explanation(action, urgency))
+
+
+def with_llm(agent, llm):
+    agent.llm = llm
+    agent.enable_llm_explanations = True
+    return llm
+
+
+def contexts_for(count):
+    """Reasoning contexts with distinct urgencies (and so distinct cache keys)"""
+    actions = list(ActionType)
+    return [
+        (actions[i % len(actions)], round(0.01 * (i + 1), 2), 0.9, wq, feed, energy, labor)
+        for i, (wq, feed, energy, labor) in enumerate(zip(*make_ponds(count)))
+    ]
+
+
+# ---------------------------------------------------------------------------
+# _decide_batch
+# ---------------------------------------------------------------------------
+
+def test_batch_decisions_match_single_pond_decisions(model_dir):
+    ponds = make_ponds(12)
+    batch_agent = XGBoostDecisionAgent(model_dir=str(model_dir), enable_llm_explanations=False)
+    single_agent = XGBoostDecisionAgent(model_dir=str(model_dir), enable_llm_explanations=False)
+
+    multi = batch_agent.make_multi_pond_decisions(*ponds)
+    assert list(multi.recommended_actions) == [wq.pond_id for wq in ponds[0]]
+    for pond_id, batched in multi.recommended_actions.items():
+        single = single_agent.make_decision(*ponds, pond_id=pond_id)
+        assert single.pond_id == batched.pond_id == pond_id
+        assert single.primary_action == batched.primary_action
+        assert single.urgency_score == pytest.approx(batched.urgency_score)
+        assert single.action_intensity == pytest.approx(batched.action_intensity)
+        assert single.confidence == pytest.approx(batched.confidence)
+        assert single.affected_factors == batched.affected_factors
+        assert single.reasoning == batched.reasoning
+
+
+def test_batch_decisions_match_the_fitted_models(agent):
+    ponds = make_ponds(20)
+    rows = make_rows(ponds)
+    x = features_for(agent, ponds)
+    expected_actions = [agent._map_action(agent._enc_to_orig[int(enc)]) for enc in agent.action_model.predict(x)]
+    expected_urgency = np.clip(agent.urgency_model.predict(x), 0.0, 1.0)
+    expected_confidence = agent.action_model.predict_proba(x).max(axis=1)
+
+    decisions = agent._decide_batch(rows)
+    assert [d.pond_id for d in decisions] == [row[0] for row in rows]
+    assert [d.primary_action for d in decisions] == expected_actions
+    np.testing.assert_allclose([d.urgency_score for d in decisions], expected_urgency, rtol=1e-5)
+    np.testing.assert_allclose([d.confidence for d in decisions], expected_confidence, rtol=1e-5)
+    assert len({d.timestamp for d in decisions}) == 1
+
+
+# ---------------------------------------------------------------------------
+# _predict_cached
+# ---------------------------------------------------------------------------
+
+def count_model_calls(agent, monkeypatch):
+    """Record how many feature rows reach the models per _predict_cached call"""
+    rows_seen = []
+    predict_actions = agent._predict_actions
+
+    def counting_predict_actions(x):
+        rows_seen.append(len(x))
+        return predict_actions(x)
+
+    monkeypatch.setattr(agent, "_predict_actions", counting_predict_actions)
+    return rows_seen
+
+
+def test_prediction_cache_only_sends_new_rows_to_the_models(agent, monkeypatch):
+    rows_seen = count_model_calls(agent, monkeypatch)
+    x = features_for(agent, make_ponds(8))
+
+    first = agent._predict_cached(x)
+    assert rows_seen == [8]
+    assert len(agent._prediction_cache) == 8
+
+    assert agent._predict_cached(x) == first
+    assert rows_seen == [8]
+
+    # Duplicated and new rows: only the unseen row is predicted, order is kept
+    new_row = features_for(agent, make_ponds(1, seed=SEED + 1))
+    mixed = np.concatenate([x[:2], new_row, x[:2]])
+    predictions = agent._predict_cached(mixed)
+    assert rows_seen == [8, 1]
+    assert predictions[:2] == first[:2] == predictions[3:]
+    assert predictions[2] == agent._prediction_cache[new_row[0].tobytes()]
+
+
+def test_prediction_cache_evicts_least_recently_used(agent, monkeypatch):
+    monkeypatch.setattr(agent_module, "PREDICTION_CACHE_SIZE", 3)
+    rows_seen = count_model_calls(agent, monkeypatch)
+    x = features_for(agent, make_ponds(4))
+
+    agent._predict_cached(x[:3])
+    agent._predict_cached(x[:1])  # row 0 becomes most recently used
+    agent._predict_cached(x[3:])  # evicts row 1
+    assert list(agent._prediction_cache) == [x[2].tobytes(), x[0].tobytes(), x[3].tobytes()]
+
+    agent._predict_cached(x[:1])
+    agent._predict_cached(x[1:2])
+    assert rows_seen == [3, 1, 1]
+
+
+# ---------------------------------------------------------------------------
+# _gather_reasonings
+# ---------------------------------------------------------------------------
+
+def expected_explanation(context):
+    primary_action, urgency = context[:2]
+    return StubLLM.explanation(primary_action.value, f"{urgency:.2f}")
+
+
+def test_marshaled_replies_map_back_in_order(agent):
+    llm = with_llm(agent, StubLLM())
+    count = agent_module.MARSHAL_MAX_BATCH + 5
+    contexts = contexts_for(count)
+
+    explanations = asyncio.run(agent._gather_reasonings(contexts))
+    assert explanations == [expected_explanation(context) for context in contexts]
+    assert llm.marshaled_calls == 2  # one full group and the remainder
+    assert llm.single_calls == 0
+
+
+def test_missing_marshaled_entries_are_retried_singly(agent):
+    llm = with_llm(agent, StubLLM(drop={2, 5}))
+    contexts = contexts_for(agent_module.MARSHAL_MIN_BATCH + 2)
+
+    explanations = asyncio.run(agent._gather_reasonings(contexts))
+    assert explanations == [expected_explanation(context) for context in contexts]
+    assert llm.marshaled_calls == 1
+    assert llm.single_calls == 2
+
+
+def test_small_batches_are_explained_one_call_each(agent):
+    llm = with_llm(agent, StubLLM())
+    contexts = contexts_for(agent_module.MARSHAL_MIN_BATCH - 1)
+
+    explanations = asyncio.run(agent._gather_reasonings(contexts))
+    assert explanations == [expected_explanation(context) for context in contexts]
+    assert llm.marshaled_calls == 0
+    assert llm.single_calls == len(contexts)
+
+
+def test_cached_explanations_skip_the_llm(agent):
+    llm = with_llm(agent, StubLLM())
+    contexts = contexts_for(6)
+
+    first = agent._generate_reasonings(contexts)
+    calls = llm.marshaled_calls + llm.single_calls
+    assert first == [expected_explanation(context) for context in contexts]
+    assert agent._generate_reasonings(contexts) == first
+    assert llm.marshaled_calls + llm.single_calls == calls
@@ -20,6 +20,7 @@ except ImportError:
     sys.exit(1)
 
 from models.autogluon_decision_agent import AutoGluonDecisionAgent
+from models.decision_model import FeatureExtractor
 from models.training.data_generator import TrainingDataGenerator
 import numpy as np
 
@@ -44,56 +45,22 @@ def train_autogluon_models(num_samples: int = 10000, time_limit: int = 300):
     
     # Generate training data
     print(f"\n2. Generating {num_samples} training samples...")
-    print("   This may take a few minutes...")
     
-    all_data = []
-    all_labels = {
-        'action_type': [],
-        'urgency': [],
-        'priority': [],
-        'feed_amount': []
-    }
-    
-    scenarios = ["normal", "good", "poor", "critical"]
-    
-    for i in range(num_samples):
-        if (i + 1) % 1000 == 0:
-            print(f"   Generated {i + 1}/{num_samples} samples...")
-        
-        # Generate sample - evenly distribute scenarios
-        scenario = scenarios[i % len(scenarios)]
-        wq = generator.generate_water_quality_data(1, scenario)
-        feed = generator.generate_feed_data(1, wq)
-        energy = generator.generate_energy_data(1, wq)
-        labor = generator.generate_labor_data(1, wq, energy)
-        
-        # Generate labels
-        labels = generator.generate_labels(wq, feed, energy, labor)
-        
-        # Store data
-        all_data.append({
-            'water_quality': wq,
-            'feed': feed,
-            'energy': energy,
-            'labor': labor
-        })
-        
-        all_labels['action_type'].append(labels['action_type'])
-        all_labels['urgency'].append(labels['urgency'])
-        all_labels['priority'].append(int(np.argmax(labels['priority'])) + 1)
-        all_labels['feed_amount'].append(labels['feed_amount'] * 50.0)  # Denormalize
+    # Evenly distribute scenarios and draw all samples in one vectorized batch
+    scenarios = np.resize(["normal", "good", "poor", "critical"], num_samples)
+    columns = generator.generate_columns(scenarios)
+    labels = generator.generate_labels_batch(columns)
     
     print(f"   ✓ Generated {num_samples} samples")
     
     # Prepare training data
     print("\n3. Preparing training data for AutoGluon...")
-    train_data = agent.prepare_training_data(
-        [d['water_quality'] for d in all_data],
-        [d['feed'] for d in all_data],
-        [d['energy'] for d in all_data],
-        [d['labor'] for d in all_data],
-        labels=all_labels
-    )
+    features = FeatureExtractor.features_from_columns(columns, dtype=np.float64)
+    train_data = pd.DataFrame(features, columns=agent.FEATURE_NAMES)
+    train_data['action_type'] = labels['action_type']
+    train_data['urgency'] = labels['urgency'].astype(np.float64)
+    train_data['priority'] = np.argmax(labels['priority'], axis=1) + 1
+    train_data['feed_amount'] = columns['feed_amount']
     
     print(f"   Training data shape: {train_data.shape}")
     print(f"   Features: {len(train_data.columns) - 4}")  # Exclude label columns
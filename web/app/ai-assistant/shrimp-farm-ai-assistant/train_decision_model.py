@@ -21,6 +21,8 @@ if __name__ == "__main__":
     parser.add_argument('--device', type=str, default='cpu', 
                        choices=['cpu', 'cuda'], 
                        help='Device to use for training (default: cpu)')
+    parser.add_argument('--compile', action='store_true',
+                       help='Compile the model with torch.compile (torch>=2.0; falls back to eager on failure)')
     
     args = parser.parse_args()
     
@@ -32,12 +34,14 @@ if __name__ == "__main__":
     print(f"  Epochs: {args.epochs}")
     print(f"  Batch size: {args.batch_size}")
     print(f"  Device: {args.device}")
+    print(f"  torch.compile: {'on' if args.compile else 'off'}")
     print()
     
     train_decision_model(
         num_samples=args.samples,
         epochs=args.epochs,
         batch_size=args.batch_size,
-        device=args.device
+        device=args.device,
+        compile_model=args.compile
     )
 